@@ -33,6 +33,47 @@ const ALLOWED_MEASURES = new Set([
   'Daily fine particulate matter',
 ]);
 
+// GET documentation body, serialized once at module load
+const API_DOCS_BODY = JSON.stringify({
+  message: "CS1060 HW4 - County Health Data API",
+  endpoint: "/county_data",
+  method: "POST",
+  content_type: "application/json",
+  required_fields: ["zip", "measure_name"],
+  optional_fields: ["coffee"],
+  example: {
+    zip: "02138",
+    measure_name: "Adult obesity"
+  },
+  allowed_measures: [...ALLOWED_MEASURES],
+  special_behavior: "Set coffee=teapot for HTTP 418 response"
+});
+
+// Length + char-code check; same result as /^\d{5}$/ without the regex engine
+function isFiveDigitZip(s) {
+  if (s.length !== 5) return false;
+  for (let i = 0; i < 5; i++) {
+    const c = s.charCodeAt(i);
+    if (c < 48 || c > 57) return false;
+  }
+  return true;
+}
+
+// Lookup SQL, compiled once per connection and reused on every request.
+// zip_lookup (built by csv_to_sqlite.py) maps each ZIP to its county with a
+// primary-key seek, then the health rows are LEFT JOINed: no rows means
+// unknown ZIP, a single all-NULL row means the ZIP exists but has no data
+// for the measure.
+const LOOKUP_SQL =
+  'SELECT chr.state, chr.county, chr.state_code, chr.county_code, chr.year_span, ' +
+  'chr.measure_name, chr.measure_id, chr.numerator, chr.denominator, chr.raw_value, ' +
+  'chr.confidence_interval_lower_bound, chr.confidence_interval_upper_bound, ' +
+  'chr.data_release_year, chr.fipscode ' +
+  'FROM zip_lookup AS zl ' +
+  'LEFT JOIN county_health_rankings AS chr ' +
+  'ON chr.county = zl.county AND chr.state = zl.state AND chr.measure_name = ? ' +
+  'WHERE zl.zip = ?';
+
 // Database connection using better-sqlite3 (Vercel-compatible)
 let db = null;
 function getDb() {
@@ -59,36 +100,88 @@ function getDb() {
     }
     
     db = new Database(dbPath, { readonly: true });
+    db.pragma('query_only = 1');
+    // Read-path tuning: memory-map the whole file. On a read-only connection
+    // SQLite serves pages straight from the mapping, so the page cache
+    // (64MB) only matters for pages beyond mmap_size.
+    db.pragma('mmap_size = 1073741824');
+    db.pragma('cache_size = -65536');
+    db.pragma('temp_store = MEMORY');
   }
   return db;
 }
 
+// The prepared statement is cached alongside the connection so warm
+// invocations skip SQL parsing and planning entirely.
+let lookupStmt = null;
+function getLookupStatement() {
+  if (!lookupStmt) {
+    lookupStmt = getDb().prepare(LOOKUP_SQL);
+  }
+  return lookupStmt;
+}
+
+// Open the connection and prepare the lookup at module load. On Vercel this
+// still runs inside the first (cold) invocation, so it only does the work
+// that request needs anyway; no extra pages are read.
+try {
+  getLookupStatement();
+} catch (err) {
+  // Leave connection errors to the handler, which reports them per request
+}
+
+// Serialize once with JSON.stringify and write the body directly, skipping
+// the res.json() helper's extra pass (ETag hashing over the whole body).
+function sendBody(res, status, body) {
+  res.statusCode = status;
+  res.setHeader('Content-Type', 'application/json; charset=utf-8');
+  res.setHeader('Content-Length', Buffer.byteLength(body));
+  return res.end(body);
+}
+
 function send(res, status, payload) {
-  return res.status(status).json(payload);
+  return sendBody(res, status, JSON.stringify(payload));
 }
 
-module.exports = async function handler(req, res) {
+// In-process LRU of serialized lookup responses keyed by zip + measure.
+// The bundled data.db is read-only, so entries never go stale for the life
+// of the function instance. Map iteration order doubles as recency order.
+const LOOKUP_CACHE_SIZE = 4096;
+const lookupCache = new Map();
+
+function cacheGet(key) {
+  const hit = lookupCache.get(key);
+  if (hit !== undefined) {
+    lookupCache.delete(key);
+    lookupCache.set(key, hit);
+  }
+  return hit;
+}
+
+function cachePut(key, entry) {
+  if (lookupCache.size >= LOOKUP_CACHE_SIZE) {
+    lookupCache.delete(lookupCache.keys().next().value);
+  }
+  lookupCache.set(key, entry);
+}
+
+// Run the lookup and return the { status, body } pair to send and cache
+function lookup(zipStr, measureName) {
+  const results = getLookupStatement().all(measureName, zipStr);
+
+  if (results.length === 0) {
+    return { status: 404, body: JSON.stringify({ error: 'not_found', detail: 'ZIP not found in dataset' }) };
+  }
+  if (results[0].measure_name === null) {
+    return { status: 404, body: JSON.stringify({ error: 'not_found', detail: 'No data for given zip and measure_name' }) };
+  }
+  return { status: 200, body: JSON.stringify(results) };
+}
+
+module.exports = function handler(req, res) {
   // Handle GET requests with helpful documentation
   if (req.method === 'GET') {
-    return send(res, 200, {
-      message: "CS1060 HW4 - County Health Data API",
-      endpoint: "/county_data",
-      method: "POST",
-      content_type: "application/json",
-      required_fields: ["zip", "measure_name"],
-      optional_fields: ["coffee"],
-      example: {
-        zip: "02138",
-        measure_name: "Adult obesity"
-      },
-      allowed_measures: [
-        "Violent crime rate", "Unemployment", "Children in poverty",
-        "Diabetic screening", "Mammography screening", "Preventable hospital stays",
-        "Uninsured", "Sexually transmitted infections", "Physical inactivity",
-        "Adult obesity", "Premature Death", "Daily fine particulate matter"
-      ],
-      special_behavior: "Set coffee=teapot for HTTP 418 response"
-    });
+    return sendBody(res, 200, API_DOCS_BODY);
   }
   
   if (req.method !== 'POST') {
@@ -102,13 +195,13 @@ module.exports = async function handler(req, res) {
   const { zip = '', measure_name = '', coffee } = req.body || {};
 
   if (coffee === 'teapot') {
-    return res.status(418).json({ error: null, result: "I'm a teapot" });
+    return send(res, 418, { error: null, result: "I'm a teapot" });
   }
 
   const zipStr = String(zip).trim();
   const measureName = String(measure_name).trim();
 
-  if (!/^\d{5}$/.test(zipStr)) {
+  if (!isFiveDigitZip(zipStr)) {
     return send(res, 400, { error: 'bad_request', detail: 'zip must be a 5-digit string' });
   }
   if (!ALLOWED_MEASURES.has(measureName)) {
@@ -116,32 +209,13 @@ module.exports = async function handler(req, res) {
   }
 
   try {
-    const db = getDb();
-
-    // Resolve county + state for the ZIP
-    const zipStmt = db.prepare('SELECT county, state_abbreviation AS state FROM zip_county WHERE zip = ? LIMIT 1');
-    const zipResult = zipStmt.get(zipStr);
-
-    if (!zipResult) {
-      return send(res, 404, { error: 'not_found', detail: 'ZIP not found in dataset' });
+    const cacheKey = zipStr + '|' + measureName;
+    let entry = cacheGet(cacheKey);
+    if (entry === undefined) {
+      entry = lookup(zipStr, measureName);
+      cachePut(cacheKey, entry);
     }
-
-    const { county, state } = zipResult;
-
-    // Fetch rows from county_health_rankings
-    const chrStmt = db.prepare(
-      'SELECT state, county, state_code, county_code, year_span, measure_name, measure_id, ' +
-      'numerator, denominator, raw_value, confidence_interval_lower_bound, ' +
-      'confidence_interval_upper_bound, data_release_year, fipscode ' +
-      'FROM county_health_rankings WHERE county = ? AND state = ? AND measure_name = ?'
-    );
-    const results = chrStmt.all(county, state, measureName);
-
-    if (results.length === 0) {
-      return send(res, 404, { error: 'not_found', detail: 'No data for given zip and measure_name' });
-    }
-
-    return send(res, 200, results);
+    return sendBody(res, entry.status, entry.body);
   } catch (err) {
     return send(res, 500, { error: 'server_error', detail: String(err) });
   }
@@ -12,21 +12,72 @@ Notes:
 - Column names are taken from the CSV header and sanitized similarly.
 - All columns are created as TEXT to match the assignment's example schema.
 - Existing table with the same name will be dropped and recreated.
-- Inserts are batched inside a single transaction using parameterized queries.
+- The drop/create, inserts and index builds run in a single exclusive transaction using parameterized queries.
+- The load runs without a rollback journal or fsync; re-run the script if it is interrupted.
+- Known tables (zip_county, county_health_rankings) get lookup indexes after loading.
+- Loading zip_county also rebuilds zip_lookup, a one-row-per-ZIP (zip -> county, state) table.
 
 Attribution:
 - This file was created with assistance from a generative AI coding assistant (Cascade), and then reviewed/edited by the author to meet assignment requirements.
 """
 
 import csv
+import itertools
 import os
 import re
 import sqlite3
+import string
 import sys
-from typing import List, Tuple
+from typing import Iterator, List, Optional
 
 
 IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+UNDERSCORES_RE = re.compile(r"_+")
+
+
+class _IdentifierCharMap(dict):
+    """str.translate table: keeps ASCII letters, digits and '_', maps everything else to '_'."""
+
+    def __missing__(self, codepoint: int) -> str:
+        return "_"
+
+
+IDENTIFIER_CHARS = _IdentifierCharMap({ord(c): c for c in string.ascii_letters + string.digits + "_"})
+
+# Bulk-load settings: 8KB pages (applies only when the database file is new), no rollback
+# journal or fsync, exclusive lock, in-memory temp, ~200MB page cache.
+# The database is a generated artifact, so a crash mid-load just means re-running the script.
+LOAD_PRAGMAS = [
+    "PRAGMA page_size=8192;",
+    "PRAGMA journal_mode=OFF;",
+    "PRAGMA synchronous=OFF;",
+    "PRAGMA locking_mode=EXCLUSIVE;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-200000;",
+]
+
+# Derived lookup tables rebuilt after their source table is loaded, keyed by source table.
+# zip_lookup pins each ZIP to its first county row in CSV order, the county the API reports.
+DERIVED_TABLES = {
+    "zip_county": [
+        "DROP TABLE IF EXISTS zip_lookup;",
+        "CREATE TABLE zip_lookup (zip TEXT PRIMARY KEY, county TEXT, state TEXT) WITHOUT ROWID;",
+        "INSERT INTO zip_lookup (zip, county, state) "
+        "SELECT zip, county, state_abbreviation FROM "
+        "(SELECT zip, county, state_abbreviation, min(rowid) FROM zip_county WHERE zip IS NOT NULL GROUP BY zip);",
+        "ANALYZE zip_lookup;",
+    ],
+}
+
+# Secondary indexes for the equality lookups done by the API, keyed by table name.
+TABLE_INDEXES = {
+    "zip_county": [
+        "CREATE INDEX idx_zip_county_zip ON zip_county (zip);",
+    ],
+    "county_health_rankings": [
+        "CREATE INDEX idx_chr_lookup ON county_health_rankings (county, state, measure_name);",
+    ],
+}
 
 
 def sanitize_identifier(name: str) -> str:
@@ -39,12 +90,12 @@ def sanitize_identifier(name: str) -> str:
     if name is None:
         name = ""
     # Lowercase and replace non-alnum/underscore with underscore
-    cleaned = re.sub(r"[^A-Za-z0-9_]", "_", name.strip().lower())
+    cleaned = name.strip().lower().translate(IDENTIFIER_CHARS)
     # Ensure starts with a letter or underscore
-    if not cleaned or not re.match(r"^[A-Za-z_]", cleaned):
+    if not cleaned or cleaned[0].isdigit():
         cleaned = f"_{cleaned}" if cleaned else "_col"
     # Collapse multiple underscores
-    cleaned = re.sub(r"_+", "_", cleaned)
+    cleaned = UNDERSCORES_RE.sub("_", cleaned)
     return cleaned
 
 
@@ -54,7 +105,7 @@ def derive_table_name(csv_path: str) -> str:
     return sanitize_identifier(stem)
 
 
-def read_csv_header_and_rows(csv_path: str) -> Tuple[List[str], List[List[str]]]:
+def read_csv_header(csv_path: str) -> List[str]:
     # Use utf-8-sig to handle optional BOM
     with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
         reader = csv.reader(f)
@@ -62,10 +113,48 @@ def read_csv_header_and_rows(csv_path: str) -> Tuple[List[str], List[List[str]]]
             header = next(reader)
         except StopIteration:
             raise ValueError("CSV appears to be empty (no header row)")
-        if not header:
-            raise ValueError("CSV header row is empty")
-        rows: List[List[str]] = [row for row in reader]
-    return header, rows
+    if not header:
+        raise ValueError("CSV header row is empty")
+    return header
+
+
+def iter_rows(csv_path: str, ncols: int) -> Iterator[List[Optional[str]]]:
+    """Stream data rows, padded with None or truncated to ``ncols``."""
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # skip header
+        for row in reader:
+            # Only copy ragged rows; exact-width rows go to sqlite3 untouched
+            width = len(row)
+            if width == ncols:
+                yield row
+            elif width < ncols:
+                yield row + [None] * (ncols - width)
+            else:
+                yield row[:ncols]
+
+
+def insert_rows(cur: sqlite3.Cursor, table: str, insert_sql: str, csv_path: str, ncols: int) -> None:
+    """Insert all data rows, feeding csv.reader straight to executemany when possible.
+
+    Rectangular CSVs (the common case) skip per-row padding entirely. If a
+    ragged row turns up, the partial insert is cleared and the load is redone
+    through ``iter_rows`` normalization.
+    """
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # skip header
+        first = next(reader, None)
+        if first is None:
+            return
+        if len(first) == ncols:
+            try:
+                cur.executemany(insert_sql, itertools.chain((first,), reader))
+                return
+            except sqlite3.ProgrammingError:
+                # Row width mismatch somewhere past the first row
+                cur.execute(f"DELETE FROM {table};")
+    cur.executemany(insert_sql, iter_rows(csv_path, ncols))
 
 
 def build_create_table_sql(table: str, columns: List[str]) -> str:
@@ -90,8 +179,8 @@ def main(argv: List[str]) -> int:
     # Derive table name
     table_name = derive_table_name(csv_path)
 
-    # Read CSV
-    header, rows = read_csv_header_and_rows(csv_path)
+    # Read CSV header; data rows are streamed straight into the insert
+    header = read_csv_header(csv_path)
 
     # Sanitize column names
     sanitized_cols = [sanitize_identifier(col) for col in header]
@@ -105,19 +194,20 @@ def main(argv: List[str]) -> int:
     conn = sqlite3.connect(db_path)
     try:
         cur = conn.cursor()
-        # Drop and recreate table for idempotency
+        for pragma_sql in LOAD_PRAGMAS:
+            cur.execute(pragma_sql)
+        # Drop, recreate (idempotent) and load in one exclusive transaction
+        cur.execute("BEGIN EXCLUSIVE")
         cur.execute(f"DROP TABLE IF EXISTS {table_name};")
         cur.execute(create_sql)
-
-        # Insert in a transaction
-        conn.execute("BEGIN")
-        if rows:
-            # Normalize row lengths: pad/truncate to header length
-            normalized = [
-                (row + [None] * (len(sanitized_cols) - len(row)))[: len(sanitized_cols)]
-                for row in rows
-            ]
-            cur.executemany(insert_sql, normalized)
+        insert_rows(cur, table_name, insert_sql, csv_path, len(sanitized_cols))
+
+        # Build lookup indexes after the bulk insert and refresh planner stats
+        for index_sql in TABLE_INDEXES.get(table_name, []):
+            cur.execute(index_sql)
+        cur.execute(f"ANALYZE {table_name};")
+        for derived_sql in DERIVED_TABLES.get(table_name, []):
+            cur.execute(derived_sql)
         conn.commit()
     except Exception:
         conn.rollback()
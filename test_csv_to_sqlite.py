@@ -4,8 +4,10 @@ Basic automated test for csv_to_sqlite.py
 
 - Removes data.db
 - Loads zip_county.csv and county_health_rankings.csv into data.db
-- Verifies expected schemas (column names and order)
+- Verifies expected schemas (column names and order), including the derived zip_lookup table
+- Verifies lookup indexes
 - Verifies row counts
+- Verifies ragged rows (short, long, blank) are padded with NULL / truncated
 
 Note: Row counts are based on the Feb 2025 datasets referenced in the assignment.
 If you use different dataset versions, counts may differ.
@@ -17,6 +19,7 @@ import os
 import sqlite3
 import subprocess
 import sys
+import tempfile
 
 EXPECTED_ZIP_COUNTY_COLS = [
     "zip",
@@ -48,8 +51,16 @@ EXPECTED_CHR_COLS = [
     "fipscode",
 ]
 
+EXPECTED_ZIP_LOOKUP_COLS = ["zip", "county", "state"]
+
+EXPECTED_INDEXES = {
+    "zip_county": ["idx_zip_county_zip"],
+    "county_health_rankings": ["idx_chr_lookup"],
+}
+
 EXPECTED_ZIP_COUNT = 54553
 EXPECTED_CHR_COUNT = 303864
+EXPECTED_ZIP_LOOKUP_COUNT = 39490
 
 
 def run(cmd: list[str]) -> None:
@@ -63,6 +74,41 @@ def get_cols(conn: sqlite3.Connection, table: str) -> list[str]:
     return [row[1] for row in cur.fetchall()]
 
 
+def get_indexes(conn: sqlite3.Connection, table: str) -> list[str]:
+    cur = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name=? ORDER BY name;",
+        (table,),
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+# First row matches the header, so the loader starts on its direct csv.reader
+# path and must fall back to normalization when the ragged rows show up.
+RAGGED_CSV = "a,b,c\n1,2,3\n4,5\n6,7,8,9\n\n10,11,12\n"
+EXPECTED_RAGGED_ROWS = [
+    ("1", "2", "3"),
+    ("4", "5", None),
+    ("6", "7", "8"),
+    (None, None, None),
+    ("10", "11", "12"),
+]
+
+
+def check_ragged_csv(script_path: str) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "ragged.csv")
+        db_path = os.path.join(tmp, "ragged.db")
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            f.write(RAGGED_CSV)
+        run([sys.executable, script_path, db_path, csv_path])
+        conn = sqlite3.connect(db_path)
+        try:
+            rows = conn.execute("select a, b, c from ragged order by rowid;").fetchall()
+        finally:
+            conn.close()
+    assert rows == EXPECTED_RAGGED_ROWS, f"ragged rows mismatch:\n{rows}"
+
+
 def main() -> int:
     here = os.path.dirname(os.path.abspath(__file__))
     db_path = os.path.join(here, "data.db")
@@ -84,12 +130,29 @@ def main() -> int:
         chr_cols = get_cols(conn, "county_health_rankings")
         assert zip_cols == EXPECTED_ZIP_COUNTY_COLS, f"zip_county columns mismatch:\n{zip_cols}"
         assert chr_cols == EXPECTED_CHR_COLS, f"county_health_rankings columns mismatch:\n{chr_cols}"
+        zip_lookup_cols = get_cols(conn, "zip_lookup")
+        assert zip_lookup_cols == EXPECTED_ZIP_LOOKUP_COLS, f"zip_lookup columns mismatch:\n{zip_lookup_cols}"
+
+        # Index checks
+        for table, expected in EXPECTED_INDEXES.items():
+            indexes = get_indexes(conn, table)
+            assert indexes == expected, f"{table} indexes mismatch:\n{indexes}"
 
         # Count checks
         zip_count = conn.execute("select count(*) from zip_county;").fetchone()[0]
         chr_count = conn.execute("select count(*) from county_health_rankings;").fetchone()[0]
         assert zip_count == EXPECTED_ZIP_COUNT, f"zip_county count {zip_count} != {EXPECTED_ZIP_COUNT}"
         assert chr_count == EXPECTED_CHR_COUNT, f"county_health_rankings count {chr_count} != {EXPECTED_CHR_COUNT}"
+        zip_lookup_count = conn.execute("select count(*) from zip_lookup;").fetchone()[0]
+        assert zip_lookup_count == EXPECTED_ZIP_LOOKUP_COUNT, f"zip_lookup count {zip_lookup_count} != {EXPECTED_ZIP_LOOKUP_COUNT}"
+
+        # zip_lookup keeps the first county listed for multi-county ZIPs
+        first = conn.execute("select county, state_abbreviation from zip_county where zip = '00601' limit 1;").fetchone()
+        pinned = conn.execute("select county, state from zip_lookup where zip = '00601';").fetchone()
+        assert pinned == first, f"zip_lookup 00601 {pinned} != {first}"
+
+        # Ragged input normalization
+        check_ragged_csv(os.path.join(here, "csv_to_sqlite.py"))
 
         print("All tests passed.")
         return 0